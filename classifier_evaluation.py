@@ -1,3 +1,5 @@
+from collections import Counter
+
 from classifier import Example, Category
 
 
@@ -5,17 +7,13 @@ class ClassifierEvaluation:
     def __init__(self, classified_examples: set[Example], b: float = 1):
 
         example_count = len(classified_examples)
-        true_positives = true_negatives = false_negatives = false_positives = 0
-
-        for example in classified_examples:
-            if example.actual == Category.POS and example.predicted == Category.POS:
-                true_positives += 1
-            elif example.actual == Category.NEG and example.predicted == Category.NEG:
-                true_negatives += 1
-            elif example.actual == Category.POS and example.predicted == Category.NEG:
-                false_negatives += 1
-            elif example.actual == Category.NEG and example.predicted == Category.POS:
-                false_positives += 1
+
+        # tally the whole confusion matrix in one C-level pass
+        confusion = Counter((example.actual, example.predicted) for example in classified_examples)
+        true_positives = confusion[Category.POS, Category.POS]
+        true_negatives = confusion[Category.NEG, Category.NEG]
+        false_negatives = confusion[Category.POS, Category.NEG]
+        false_positives = confusion[Category.NEG, Category.POS]
 
         self.accuracy_true: float = (true_positives + true_negatives) / example_count
 
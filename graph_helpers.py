@@ -1,6 +1,6 @@
+import csv
 import os
 import sys
-from csv import excel
 
 from main import main_test
 from timed import timed
@@ -113,17 +113,22 @@ def overfit_to_file(data_dir: str, output_file_name: str) -> None:
     """
     data = get_overfit_data(data_dir)
     
+    counts = data[0]
     for i, fname in enumerate(["id3", "rf"]):
         for j, mode in enumerate(["tr", "te"]):
-            with open(f"{output_file_name}_{fname}_accuracy_{mode}.csv", mode="w") as f:
-                f.write(f"count,accuracy_{mode}\n")
-                for count, stat in zip(data[0], data[2*i+1+j]):
-                    f.write(f"{count},{stat.accuracy()}\n")
-
-            with open(f"{output_file_name}_{fname}_prec_rec_f_{mode}.csv", mode="w") as f:
-                f.write(f"count,accuracy_{mode},recall_{mode},f_measure_{mode}\n")
-                for count, stat in zip(data[0], data[2*i+1+j]):
-                    f.write(f"{count},{stat.precision()},{stat.recall()},{stat.f_measure()}\n")
+            stats = data[2 * i + 1 + j]
+
+            with open(f"{output_file_name}_{fname}_accuracy_{mode}.csv", mode="w", newline="") as f:
+                writer = csv.writer(f, lineterminator="\n")
+                writer.writerow(["count", f"accuracy_{mode}"])
+                writer.writerows((count, stat.accuracy())
+                                 for count, stat in zip(counts, stats))
+
+            with open(f"{output_file_name}_{fname}_prec_rec_f_{mode}.csv", mode="w", newline="") as f:
+                writer = csv.writer(f, lineterminator="\n")
+                writer.writerow(["count", f"accuracy_{mode}", f"recall_{mode}", f"f_measure_{mode}"])
+                writer.writerows((count, stat.precision(), stat.recall(), stat.f_measure())
+                                 for count, stat in zip(counts, stats))
         
     
     
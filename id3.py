@@ -1,4 +1,6 @@
 import math
+from collections.abc import Iterable
+from functools import lru_cache
 
 from classifier import Example, Category, Classifier
 from timed import timed
@@ -7,24 +9,26 @@ from timed import timed
 class Node:
     """
     An internal data structure used to construct an ID3 tree and later traverse it.
-    The `attribute` field indicates the attribute that is being tested at this Node and the
-    `children` dictionary contains references to the appropriate Nodes that should be traversed
-    based on the value of the `attribute` in an Example.
+    The `attribute` field holds the index (into the tree's attribute tuple) of the attribute
+    that is being tested at this Node and the `children` pair contains references to the
+    appropriate Nodes that should be traversed based on the value of that attribute in an
+    Example: index 0 holds the subtree for examples without the attribute and index 1 the
+    subtree for examples with it.
     The `category` field is NONE iff this Node is internal in the tree. A non-NONE value indicates
     that upon reaching this Node, the predicted Category of an Example will be that category.
     """
 
-    def __init__(self, category: Category, attribute: str):
+    def __init__(self, category: Category, attribute: int):
         self.category: Category = category
-        self.children: dict[bool, Node] = dict()
-        self.attribute: str = attribute
+        self.children: tuple['Node', 'Node'] | None = None
+        self.attribute: int = attribute
 
     @staticmethod
-    def internal(attribute: str) -> 'Node':
+    def internal(attribute: int) -> 'Node':
         """
         Returns an internal Node of an ID3 tree, responsible for an attribute.
         The Node's Category is set to NONE.
-        :param attribute: the attribute that shall be checked in this Node
+        :param attribute: the index of the attribute that shall be checked in this Node
         :return: the Node
         """
         return Node(Category.NONE, attribute)
@@ -33,11 +37,11 @@ class Node:
     def leaf(category: Category) -> 'Node':
         """
         Returns a leaf Node of an ID3 tree, responsible for a classification.
-        The Node's Attribute is set to "".
+        The Node's Attribute is set to -1.
         :param category: the Category with which Examples will be classified according to this Node
         :return: the Node
         """
-        return Node(category, "")
+        return Node(category, -1)
 
 
 class ID3(Classifier):
@@ -47,7 +51,7 @@ class ID3(Classifier):
 
     @classmethod
     # @timed(prompt="Train ID3")
-    def create_timed(cls, examples: set[Example], attributes: set[str]):
+    def create_timed(cls, examples: Iterable[Example], attributes: Iterable[str]):
         """
         A timed wrapper for the creation of an ID3 tree.
         :param examples: the examples on which to train the ID3 classifier
@@ -57,14 +61,66 @@ class ID3(Classifier):
         """
         return ID3(examples, attributes)
 
-    def __init__(self, examples: set[Example], attributes: set[str]):
+    def __init__(self, examples: Iterable[Example], attributes: Iterable[str]):
         """
         Creates a new ID3 classifier by training it on the provided training data.
+        The presence of every attribute across the examples is packed once into an integer
+        bitmask (bit i is set iff example i contains the attribute), so that all counting
+        during tree construction is done with bitwise operations and popcounts instead of
+        repeated scans over sets of Example objects.
         :param examples: the examples on which to train the ID3 classifier
         :param attributes: the attributes that will be used to classify the examples
         cease expanding the tree
         """
-        self.root: Node = self.id3_recursive(examples, attributes, Category.NONE)
+        examples = tuple(examples)
+
+        # attributes are referred to by index from here on; the words themselves are only
+        # needed again when a classified example is tested for membership
+        attribute_words: tuple[str, ...] = tuple(attributes)
+        word_indices = {word: index for index, word in enumerate(attribute_words)}
+
+        attribute_masks: list[int] = [0] * len(attribute_words)
+        positive_mask = 0
+        for index, example in enumerate(examples):
+            bit = 1 << index
+            if example.actual == Category.POS:
+                positive_mask |= bit
+            for attribute in example.attributes:
+                word_index = word_indices.get(attribute)
+                if word_index is not None:
+                    attribute_masks[word_index] |= bit
+
+        self._attribute_words: tuple[str, ...] = attribute_words
+        self._attribute_masks: list[int] = attribute_masks
+        self._positive_mask: int = positive_mask
+
+        all_examples_mask = (1 << len(examples)) - 1
+        self.root: Node = self.id3_recursive(all_examples_mask, set(range(len(attribute_words))),
+                                             Category.NONE, len(examples), positive_mask.bit_count())
+
+        # flatten the finished tree into parallel arrays; classification walks integer node
+        # indices through flat lists instead of chasing Node objects
+        self._node_words: list[str | None] = []
+        self._node_children: list[tuple[int, int] | None] = []
+        self._node_categories: list[Category] = []
+        self._flatten(self.root)
+
+    def _flatten(self, node: Node) -> int:
+        """
+        Appends the subtree rooted at `node` to the flat node arrays in depth-first order.
+        :param node: the root of the subtree to flatten
+        :return: the index assigned to `node`
+        """
+        index = len(self._node_categories)
+        self._node_categories.append(node.category)
+        self._node_words.append(self._attribute_words[node.attribute] if node.attribute >= 0 else None)
+        self._node_children.append(None)
+
+        if node.category is Category.NONE:
+            self._node_children[index] = (self._flatten(node.children[0]),
+                                          self._flatten(node.children[1]))
+
+        return index
 
     def classify(self, test_example: Example) -> Category:
         """
@@ -73,35 +129,80 @@ class ID3(Classifier):
         :param test_example: The example to be classified
         :return: The predicted Category of the example.
         """
-        curr: Node = self.root
-        while curr.category == Category.NONE:
-            curr = curr.children[curr.attribute in test_example.attributes]
+        node_words = self._node_words
+        node_children = self._node_children
+        node_categories = self._node_categories
+
+        node = 0
+        while node_categories[node] is Category.NONE:
+            node = node_children[node][node_words[node] in test_example.attributes]
 
-        test_example.predicted = curr.category
-        return curr.category
+        category = node_categories[node]
+        test_example.predicted = category
+        return category
 
-    def id3_recursive(self, examples: set[Example], attributes: set[str], target_category: Category) -> Node:
+    def classify_bulk(self, examples: tuple[Example]) -> None:
+        """
+        Classifies all the provided Examples with a single walk of the internal tree.
+        Instead of traversing the tree from the root once per Example, the whole batch is
+        partitioned at every internal Node by the Node's attribute, so each Node is visited
+        once per batch. The `predicted` Category of every example is updated.
+        :param examples: the examples to be classified
+        """
+        node_words = self._node_words
+        node_children = self._node_children
+        node_categories = self._node_categories
+
+        pending: list[tuple[int, list[Example]]] = [(0, list(examples))]
+
+        while pending:
+            node, group = pending.pop()
+
+            category = node_categories[node]
+            if category is not Category.NONE:
+                for example in group:
+                    example.predicted = category
+                continue
+
+            attribute = node_words[node]
+            with_attr: list[Example] = []
+            without_attr: list[Example] = []
+            for example in group:
+                if attribute in example.attributes:
+                    with_attr.append(example)
+                else:
+                    without_attr.append(example)
+
+            without_index, with_index = node_children[node]
+            pending.append((with_index, with_attr))
+            pending.append((without_index, without_attr))
+
+    def id3_recursive(self, example_mask: int, attributes: set[int], target_category: Category,
+                      example_count: int, positive_count: int) -> Node:
         """
         Generates a tree that can classify an example.
-        :param examples: the set of examples from which the tree will be constructed
-        :param attributes: the attributes that will be used to classify the examples
+        The example and positive counts of every node are known to its parent from the gain
+        search of the split, so they are threaded through the recursion as plain ints instead
+        of being recounted from the bitmask at every node.
+        :param example_mask: the bitmask selecting the examples from which the tree will be constructed
+        :param attributes: the indices of the attributes that will be used to classify the examples
         :param target_category: the most common category among the examples
+        :param example_count: the number of examples selected by example_mask
+        :param positive_count: the number of those examples with Category POS
         :return: a tree node that best classifies the examples with the given attributes
         """
         # if there are no examples, return target_category
-        if len(examples) == 0:
+        if example_count == 0:
             return Node.leaf(target_category)
 
         # if all examples belong to a single category, return that category
-        for category in Category.values():
-            if all(e.actual == category for e in examples):
-                return Node.leaf(category)
+        if positive_count == example_count:
+            return Node.leaf(Category.POS)
+        if positive_count == 0:
+            return Node.leaf(Category.NEG)
 
         # find most common category among all the examples
-        categories = dict.fromkeys(Category.values(), 0)
-        for example in examples:
-            categories[example.actual] += 1
-        most_common_category = max(categories.keys(), key=lambda k: categories[k])
+        most_common_category = Category.POS if 2 * positive_count >= example_count else Category.NEG
 
         # if there are no attributes left, return the most common category
         if len(attributes) == 0:
@@ -109,64 +210,94 @@ class ID3(Classifier):
 
         # otherwise, create a tree by splitting the examples by whether
         # they contain best_attr or not (values True or False)
-        best_attr = choose_best_attr(attributes, examples)
+        best_attr, with_count, with_positives = choose_best_attr(
+            attributes, example_mask, self._attribute_masks, self._positive_mask, example_count, positive_count)
         root = Node.internal(best_attr)
 
-        for value in {True, False}:
-            examples_subset = {e for e in examples if (best_attr in e.attributes) == value}
+        subset_with = example_mask & self._attribute_masks[best_attr]
+        subset_without = example_mask ^ subset_with
+        without_count = example_count - with_count
+        without_positives = positive_count - with_positives
 
-            # if sufficient categorization, end the tree expansion early
-            if len(examples_subset) / len(examples) > ID3.cutoff:
-                return Node.leaf(most_common_category)
+        # if sufficient categorization, end the tree expansion early
+        if max(with_count, without_count) / example_count > ID3.cutoff:
+            return Node.leaf(most_common_category)
 
-            attributes_subset = {a for a in attributes if a != best_attr}
-            subtree = self.id3_recursive(examples_subset, attributes_subset, most_common_category)
-            root.children[value] = subtree
+        # instead of copying the attribute set minus best_attr for every node, remove it
+        # from the shared set for the duration of the two recursive calls and backtrack
+        attributes.remove(best_attr)
+        root.children = (self.id3_recursive(subset_without, attributes, most_common_category,
+                                            without_count, without_positives),
+                         self.id3_recursive(subset_with, attributes, most_common_category,
+                                            with_count, with_positives))
+        attributes.add(best_attr)
 
         return root
 
 
-def choose_best_attr(attributes: set[str], examples: set[Example]) -> str:
+def choose_best_attr(attributes: set[int], example_mask: int, attribute_masks: list[int],
+                     positive_mask: int, example_count: int, pos_examples: int) -> tuple[int, int, int]:
     """
-    Returns the attribute with the maximum information gain calculated for a set of Examples.
-    :param attributes: the attributes to be examined for information gain
-    :param examples: the examples for which the information gain will be calculated
-    :return: the attribute with the maximum information gain for the examples given
+    Returns the attribute with the maximum information gain calculated for a set of Examples,
+    along with the counts of its split so the caller does not have to recount them.
+    :param attributes: the indices of the attributes to be examined for information gain
+    :param example_mask: the bitmask selecting the examples for which the information gain
+    will be calculated
+    :param attribute_masks: the presence bitmask of every attribute across all examples
+    :param positive_mask: the bitmask of the examples with Category POS
+    :param example_count: the number of examples selected by example_mask
+    :param pos_examples: the number of those examples with Category POS
+    :return: a tuple of the index of the attribute with the maximum information gain for the
+    examples given, the number of examples that contain it, and how many of those are POS
     """
 
+    # H(C) is the same for every attribute, so it is computed once outside the loop;
+    # the per-attribute work is inlined so the loop is nothing but popcounts and arithmetic
+    hc = _entropy_of_counts(pos_examples, example_count)
+
     # find the word with the maximum information gain
     max_gain = -1
-    max_gain_word = ""
+    max_gain_attr = -1
+    max_gain_count = max_gain_positives = 0
     for attribute in attributes:
-        gain = info_gain(examples, attribute)
+        examples_with_attr = example_mask & attribute_masks[attribute]
+        x_count = examples_with_attr.bit_count()
+        x_count_in_pos = (examples_with_attr & positive_mask).bit_count()
+
+        px1 = x_count / example_count
+        if x_count == 0:
+            hcx1 = hcx0 = 0.0
+        else:
+            hcx1 = _entropy_of_counts(x_count_in_pos, x_count)
+            hcx0 = _entropy_of_counts(x_count - x_count_in_pos, x_count)
+        gain = hc - (px1 * hcx1 + (1 - px1) * hcx0)
+
         if gain > max_gain:
             max_gain = gain
-            max_gain_word = attribute
+            max_gain_attr = attribute
+            max_gain_count = x_count
+            max_gain_positives = x_count_in_pos
 
-    return max_gain_word
+    return max_gain_attr, max_gain_count, max_gain_positives
 
 
-def info_gain(examples: set[Example], attribute: str) -> float:
+def info_gain(example_mask: int, attribute_mask: int, positive_mask: int) -> float:
     """
     Returns the information gain of an attribute in a set of Examples.
-    :param examples: the set of examples among which to calculate the information gain
-    :param attribute: the attribute for which to calculate the information gain
+    :param example_mask: the bitmask selecting the examples among which to calculate the
+    information gain
+    :param attribute_mask: the presence bitmask of the attribute for which to calculate the
+    information gain
+    :param positive_mask: the bitmask of the examples with Category POS
     :return: the information gain of that word in the examples
     """
-    example_count = len(examples)
-    pos_examples = 0
-    x_count = x_count_in_pos = x_count_in_neg = 0
+    example_count = example_mask.bit_count()
+    pos_examples = (example_mask & positive_mask).bit_count()
 
-    for example in examples:
-        if example.actual == Category.POS:
-            pos_examples += 1
-
-        if attribute in example.attributes:
-            x_count += 1
-            if example.actual == Category.POS:
-                x_count_in_pos += 1
-            elif example.actual == Category.NEG:
-                x_count_in_neg += 1
+    examples_with_attr = example_mask & attribute_mask
+    x_count = examples_with_attr.bit_count()
+    x_count_in_pos = (examples_with_attr & positive_mask).bit_count()
+    x_count_in_neg = x_count - x_count_in_pos
 
     # H(C) - P(X=1) * H(C|X=1) + P(X=0) * H(C|X=0)
     hc = entropy(pos_examples / example_count)
@@ -180,6 +311,19 @@ def info_gain(examples: set[Example], attribute: str) -> float:
     return hc - (px1 * hcx1 + px0 * hcx0)
 
 
+@lru_cache(maxsize=None)
+def _entropy_of_counts(positives: int, total: int) -> float:
+    """
+    Returns the entropy of `positives` successes out of `total` events, memoized.
+    The gain search only ever asks for entropies of small integer count pairs and the same
+    pairs recur constantly across nodes and trees, so each one is computed at most once.
+    :param positives: the number of events that were true
+    :param total: the total number of events
+    :return: the entropy of that ratio
+    """
+    return entropy(positives / total)
+
+
 def entropy(probability: float) -> float:
     """
     Returns the entropy associated with the probability of an event.
@@ -187,9 +331,8 @@ def entropy(probability: float) -> float:
     :return: the entropy of that event
     """
 
-    if probability == 0.0 or probability == 1.0:
-        return 0.0
-
+    # (p or 1.0) maps the p == 0 limit case to 0 * log2(1) == 0, so both degenerate
+    # probabilities fall out of the arithmetic without a branch
     p_true = probability
     p_false = 1 - probability
-    return - p_true * math.log2(p_true) - p_false * math.log2(p_false)
+    return - p_true * math.log2(p_true or 1.0) - p_false * math.log2(p_false or 1.0)
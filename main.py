@@ -3,10 +3,11 @@ from id3 import ID3
 from random_forest import RandomForest
 from test_stats import TestStats
 from classifier import Classifier, Category, Example
-from timed import timed, timed2
+from timed import timed
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 
 class TestResults:
@@ -45,12 +46,18 @@ def test_classifier(classifier: Classifier, examples: set[Example]) -> TestStats
     return TestStats(true_negatives, true_positives, false_positives, false_negatives)
 
 
-# @timed2()
+# @timed()
 def main_test(train_data_dir: str, test_data_dir: str, vocab_file_dir: str,
               example_size: int, attr_count: int, ignore_attr_count: int) -> TestResults:
-    train_data = load_examples(train_data_dir, example_size)
-    testing_data = load_examples(test_data_dir, example_size)
-    attributes = load_attributes(vocab_file_dir, attr_count, ignore_attr_count)
+    # the train and test corpora are independent, so load them concurrently and read the
+    # shared vocabulary once in the meantime; both corpora sanitize against the same
+    # translate table and intern pool
+    with ThreadPoolExecutor() as executor:
+        train_future = executor.submit(load_examples, train_data_dir, example_size)
+        test_future = executor.submit(load_examples, test_data_dir, example_size)
+        attributes = load_attributes(vocab_file_dir, attr_count, ignore_attr_count)
+        train_data = train_future.result()
+        testing_data = test_future.result()
 
     id3 = ID3.create_timed(train_data, attributes)
     rand_forest = RandomForest.create_timed(train_data, attributes)
@@ -2,9 +2,50 @@ from id3 import ID3
 from classifier import Example, Category, Classifier
 from timed import timed
 
+from concurrent.futures import ProcessPoolExecutor
 import random
 import math
 
+# flip to True to report the forest's training time; when False the timing wrapper is
+# compiled away entirely and create_timed stays a plain passthrough
+TIMED_TRAINING = False
+
+
+# training data shared by the executor's worker processes; set once per worker by
+# _init_worker so only the tree index needs to be sent per task
+_worker_examples: tuple[Example, ...] = ()
+_worker_attributes: tuple[str, ...] = ()
+_worker_examples_per_tree: int = 0
+_worker_attributes_per_tree: int = 0
+_worker_seed: int | None = None
+
+
+def _init_worker(examples: tuple[Example, ...], attributes: tuple[str, ...],
+                 examples_per_tree: int, attributes_per_tree: int, seed: int | None) -> None:
+    global _worker_examples, _worker_attributes, _worker_examples_per_tree, \
+        _worker_attributes_per_tree, _worker_seed
+    _worker_examples = examples
+    _worker_attributes = attributes
+    _worker_examples_per_tree = examples_per_tree
+    _worker_attributes_per_tree = attributes_per_tree
+    _worker_seed = seed
+
+
+def _train_tree(tree_index: int) -> ID3:
+    # each tree owns an RNG seeded by its index, so a seeded forest is reproducible
+    # no matter how the trees are distributed over the worker processes; an unseeded
+    # forest draws fresh OS entropy per tree instead of inheriting the forked state
+    rng = random.Random(None if _worker_seed is None else _worker_seed + tree_index)
+
+    # bootstrap by sampling indices into the shared example tuple; the examples are shared
+    # with the forest rather than copied, since training only reads them, and they are
+    # passed as a list so that examples drawn twice keep their double weight
+    indices = rng.choices(range(len(_worker_examples)), k=_worker_examples_per_tree)
+    examples_for_tree = [_worker_examples[index] for index in indices]
+    attributes_for_tree = rng.sample(_worker_attributes, k=_worker_attributes_per_tree)
+
+    return ID3(examples_for_tree, attributes_for_tree)
+
 
 class RandomForest(Classifier):
     """
@@ -13,9 +54,11 @@ class RandomForest(Classifier):
 
     tree_count = 150
     examples_per_tree = 1 - 1 / math.exp(1)
+    # set to an int to make every tree's sampling (and thus the whole forest) reproducible
+    seed = None
 
     @classmethod
-    # @timed(prompt="Train Random Forest")
+    @timed(prompt="Train Random Forest", enabled=TIMED_TRAINING)
     def create_timed(cls, examples: set[Example], attributes: set[str]):
         return RandomForest(examples, attributes)
 
@@ -35,25 +78,45 @@ class RandomForest(Classifier):
         attributes_per_tree = min(len(attributes), math.floor(math.sqrt(len(examples))))
         examples_per_tree = math.floor(len(examples) * RandomForest.examples_per_tree)
 
-        self.trees: set[ID3] = set()
+        # train the trees in parallel; each one is independent of the others
+        with ProcessPoolExecutor(initializer=_init_worker,
+                                 initargs=(examples, attributes, examples_per_tree,
+                                           attributes_per_tree, RandomForest.seed)) as executor:
+            self.trees: tuple[ID3, ...] = tuple(executor.map(_train_tree, range(RandomForest.tree_count)))
 
-        for _ in range(RandomForest.tree_count):
-            # pass copies of the examples, so they properly hold their "predicted" value
-            examples_for_tree = {e.copy() for e in random.choices(examples, k=examples_per_tree)}
-            attributes_for_tree = random.sample(attributes, k=attributes_per_tree)
+    def classify_bulk(self, examples: tuple[Example]) -> None:
+        """
+        Classifies all the provided examples by plurality vote of the trees created during
+        initialization. Every tree classifies the whole batch with its single-walk bulk
+        traversal and the votes are tallied per example, instead of re-running every tree
+        from the root for each example. The `predicted` Category of every example is updated.
+        :param examples: the examples to be classified
+        """
+        examples = tuple(examples)
+        positive_votes = [0] * len(examples)
 
-            trained_tree = ID3(set(examples_for_tree), set(attributes_for_tree))
-            self.trees.add(trained_tree)
+        for tree in self.trees:
+            tree.classify_bulk(examples)
+            for index, example in enumerate(examples):
+                if example.predicted is Category.POS:
+                    positive_votes[index] += 1
+
+        tree_count = len(self.trees)
+        for example, votes in zip(examples, positive_votes):
+            example.predicted = Category.POS if 2 * votes >= tree_count else Category.NEG
 
     def classify(self, example: Example) -> Category:
         """
-        Classifies the provided example by plurality vote of the trees created during initialization.
+        Classifies the provided example by plurality vote of the trees created during
+        initialization. The `predicted` Category of the example is also updated.
         :param example: The example to be classified
         :return: The predicted category of the example
         """
-        category_count: dict[Category, int] = dict.fromkeys(Category.values(), 0)
-
+        positive_votes = 0
         for tree in self.trees:
-            category_count[tree.classify(example)] += 1
+            if tree.classify(example) is Category.POS:
+                positive_votes += 1
 
-        return max(category_count.keys(), key=lambda k: category_count[k])
+        category = Category.POS if 2 * positive_votes >= len(self.trees) else Category.NEG
+        example.predicted = category
+        return category
@@ -1,8 +1,12 @@
 import os
+import sys
 
 from timed import timed
 from load_imdb import load_examples, load_attributes
-from id3 import entropy
+from classifier import Example
+from id3 import ID3, entropy
+from random_forest import RandomForest
+from main import test_classifier
 
 
 @timed(prompt="Test Load")
@@ -35,8 +39,7 @@ def test_entropy(*probabilities: float) -> list[float]:
     :return: a list that has the entropy of probability i at index i
     """
     entropies = [entropy(p) for p in probabilities]
-    for probability, probability_entropy in zip(probabilities, entropies):
-        print("H(%0.2f) = %0.5f" % (probability, probability_entropy))
+    print("\n".join("H(%0.2f) = %0.5f" % pair for pair in zip(probabilities, entropies)))
 
     assert entropy(1) == 0
     assert entropy(0) == 0
@@ -44,20 +47,33 @@ def test_entropy(*probabilities: float) -> list[float]:
 
     return entropies
 
-def find_best_cutoff():
-    max_accuracy = -1
-    max_cutoff = -1
-
-    examples = 20000
-    ignored_attrs = 25
-    count_attrs = 200
-    data_dir = sys.argv[1]
-
+def _load_evaluation_split(data_dir: str, examples: int, count_attrs: int, ignored_attrs: int) \
+        -> tuple[set[Example], set[Example], set[str]]:
+    """
+    Loads the examples once and splits them in half into a train and a test set, so a
+    parameter sweep evaluates all of its candidates on the same split without reloading
+    the corpus on every iteration.
+
+    :param data_dir: the directory containing the imdb dataset
+    :param examples: the number of examples to load
+    :param count_attrs: the number of attributes to load
+    :param ignored_attrs: the number of most frequent attributes to ignore
+    :return: a tuple with the train examples, the test examples and the attributes
+    """
     example_list: list[Example] = list(load_examples(os.path.join(data_dir, "train"), examples))
     test_examples: set[Example] = set(example_list[:len(example_list)//2])
     train_examples: set[Example] = set(example_list[len(example_list)//2:])
 
-    attributes: set[str] = load_attributes(os.path.join(sys.argv[1], "imdb.vocab"), count_attrs, ignored_attrs)
+    attributes: set[str] = load_attributes(os.path.join(data_dir, "imdb.vocab"), count_attrs, ignored_attrs)
+
+    return train_examples, test_examples, attributes
+
+
+def find_best_cutoff():
+    max_accuracy = -1
+    max_cutoff = -1
+
+    train_examples, test_examples, attributes = _load_evaluation_split(sys.argv[1], 20000, 200, 25)
 
     for i in range(70, 100, 1):
         ID3.cutoff = i/100
@@ -73,31 +89,29 @@ def find_best_cutoff():
 
 def find_best_tree_count():
     max_accuracy = -1
-    max_cutoff = -1
+    max_tree_count = -1
 
-    examples = 10000
-    ignored_attrs = 25
-    count_attrs = 200
-    data_dir = sys.argv[1]
+    train_examples, test_examples, attributes = _load_evaluation_split(sys.argv[1], 10000, 200, 25)
 
-    example_list: list[Example] = list(load_examples(os.path.join(data_dir, "train"), examples))
-    test_examples: set[Example] = set(example_list[:len(example_list)//2])
-    train_examples: set[Example] = set(example_list[len(example_list)//2:])
+    # the trees are trained independently and seeded by their index, so a forest of the
+    # largest candidate size contains a valid forest of every smaller size as a prefix;
+    # train once at the maximum and evaluate slices instead of retraining per candidate
+    tree_counts = range(70, 201, 5)
+    RandomForest.tree_count = max(tree_counts)
+    rand_forest = RandomForest(train_examples, attributes)
 
-    attributes: set[str] = load_attributes(os.path.join(sys.argv[1], "imdb.vocab"), count_attrs, ignored_attrs)
-
-    for i in range(70, 201, 5):
-        RandomForest.tree_count = i
-        rand_forest = RandomForest(train_examples, attributes)
-        results = test_classifier(rand_forest, test_examples)
+    for i in tree_counts:
+        sub_forest = RandomForest.__new__(RandomForest)
+        sub_forest.trees = rand_forest.trees[:i]
+        results = test_classifier(sub_forest, test_examples)
 
         if results.accuracy() > max_accuracy:
             max_accuracy = results.accuracy()
-            max_cutoff = i
+            max_tree_count = i
 
         print("Trying", i, "trees, accuracy=", results.accuracy())
 
-    return max_cutoff, max_accuracy
+    return max_tree_count, max_accuracy
 
 
 if __name__ == '__main__':
@@ -1,26 +1,27 @@
 import time
 
 
-def timed(prompt: str):
+def timed(prompt: str | None = None, enabled: bool = True):
     def decorator(func):
-        def inner(*args, **kwargs):
-            print(f"Starting procedure: {prompt}")
-            start = time.perf_counter()
-            rv = func(*args, **kwargs)
-            end = time.perf_counter()
-            print(f"Process `{prompt}` finished after {end - start} seconds")
-            return rv
-        return inner
-    return decorator
+        # a timer known to be disabled at decoration time adds zero overhead:
+        # the function is returned untouched, without any wrapper
+        if not enabled:
+            return func
 
+        # format everything that does not depend on the call once, at decoration time,
+        # and close over the clock so the wrapper skips the module-attribute lookup;
+        # without a prompt, only the anonymous finish line is printed
+        start_message = None if prompt is None else f"Starting procedure: {prompt}"
+        finish_prefix = "Finished after " if prompt is None else f"Process `{prompt}` finished after "
+        perf_counter = time.perf_counter
 
-def timed2():
-    def decorator(func):
         def inner(*args, **kwargs):
-            start = time.perf_counter()
+            if start_message is not None:
+                print(start_message)
+            start = perf_counter()
             rv = func(*args, **kwargs)
-            end = time.perf_counter()
-            print(f"Finished after {end - start} seconds")
+            end = perf_counter()
+            print(f"{finish_prefix}{end - start} seconds")
             return rv
         return inner
     return decorator